@@ -1,4 +1,5 @@
 import numpy as np
+import kernels
 from safety import AudioSafeGuard
 
 class BinauralBeatGenerator:
@@ -55,12 +56,12 @@ class BinauralBeatGenerator:
         left_freq = carrier
         right_freq = carrier + beat
         
-        # Generate time array
-        t = np.linspace(0, duration_sec, int(sample_rate * duration_sec), endpoint=False)
+        samples = int(sample_rate * duration_sec)
+        step = duration_sec / samples if samples else 0.0
         
         # Generate sine waves for each channel
-        left_channel = np.sin(2 * np.pi * left_freq * t)
-        right_channel = np.sin(2 * np.pi * right_freq * t)
+        left_channel = kernels.sine_bank([left_freq], [1.0], samples, step)
+        right_channel = kernels.sine_bank([right_freq], [1.0], samples, step)
         
         # Normalize each channel
         left_channel = AudioSafeGuard.normalize(left_channel, target_db=-6.0)
@@ -120,22 +121,20 @@ class IsochronicToneGenerator:
             
         print(f"[Isochronic] Generating: Carrier={carrier}Hz, Pulse={pulse}Hz, Duty={duty}")
         
-        t = np.linspace(0, duration_sec, int(sample_rate * duration_sec), endpoint=False)
+        samples = int(sample_rate * duration_sec)
+        step = duration_sec / samples if samples else 0.0
         
         # Generate carrier tone
-        carrier_wave = np.sin(2 * np.pi * carrier * t)
+        carrier_wave = kernels.sine_bank([carrier], [1.0], samples, step)
         
-        # Generate pulse envelope using square wave
-        # Use sawtooth phase for clean on/off
-        pulse_phase = (t * pulse) % 1.0
-        envelope = (pulse_phase < duty).astype(float)
-        
-        # Smooth the envelope to avoid clicks
-        # Simple smoothing: convolve with a small window
+        # Generate pulse envelope using square wave (sawtooth phase for clean on/off),
+        # smoothed by convolving with a small window to avoid clicks
         window_size = int(sample_rate * 0.005)  # 5ms smoothing
+        window = np.zeros(0)
         if window_size > 0:
             window = np.hanning(window_size * 2)
-            envelope = np.convolve(envelope, window / window.sum(), mode='same')
+            window = window / window.sum()
+        envelope = kernels.pulse_envelope(samples, step, pulse, duty, window)
         
         # Apply envelope to carrier
         audio = carrier_wave * envelope
@@ -0,0 +1,468 @@
+import numpy as np
+
+# Mirrors DEFAULT_EFFECT_PARAMS in src/lib/audio/effects.ts
+DEFAULT_EFFECT_PARAMS = {
+    'reverb': {'decay': 2, 'wetDry': 0.3},
+    'delay': {'time': 0.3, 'feedback': 0.4, 'wetDry': 0.25},
+    'echo': {'delay': 0.25, 'feedback': 0.5, 'wetDry': 0.3},
+    'chorus': {'rate': 1.5, 'depth': 10, 'wetDry': 0.4},
+    'subliminal': {'maskVolume': 0.7, 'noiseAmount': 0.3},
+    'binaural-pan': {'frequency': 10, 'panRate': 0.5},
+}
+
+# Web Audio renders in quanta of 128 frames; a DelayNode inside a feedback
+# cycle can never be shorter than one quantum.
+RENDER_QUANTUM = 128
+
+
+def _as_channels(audio: np.ndarray) -> np.ndarray:
+    """Returns audio as a float (samples, channels) array."""
+    audio = np.asarray(audio, dtype=np.float64)
+    if audio.ndim == 1:
+        return audio[:, np.newaxis]
+    return audio
+
+
+def _mix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Sums two signals the way a Web Audio GainNode mixes its inputs:
+    a mono signal is up-mixed to stereo by copying it to both channels.
+    """
+    if a.shape[1] == b.shape[1]:
+        return a + b
+    if a.shape[1] == 1:
+        return np.repeat(a, b.shape[1], axis=1) + b
+    return a + np.repeat(b, a.shape[1], axis=1)
+
+
+class ConvolutionReverb:
+    """
+    Reverb via uniformly partitioned FFT convolution (overlap-save).
+
+    Mirrors createReverbEffect: a stereo impulse of `decay` seconds of noise
+    shaped by (1 - t)^2, scaled with the ConvolverNode normalization, mixed
+    against the dry signal by `wetDry`.
+
+    The impulse is split into partitions of `block_size` samples. Each
+    incoming block is transformed once and multiplied against every
+    partition spectrum held in a frequency-domain delay line, so the cost per
+    block stays constant no matter how long the tail is.
+    """
+
+    # ConvolverNode normalization constants (Web Audio spec)
+    GAIN_CALIBRATION = 0.00125
+    GAIN_CALIBRATION_SAMPLE_RATE = 44100
+    MIN_POWER = 0.000125
+
+    def __init__(self, decay: float = 2, wetDry: float = 0.3, sample_rate: int = 44100,
+                 block_size: int = 1024, seed: int = None, impulse: np.ndarray = None, **_):
+        self.wet = wetDry
+        self.dry = 1 - wetDry
+        self.block_size = block_size
+
+        if impulse is None:
+            impulse = self.generate_impulse(decay, sample_rate, seed)
+        impulse = _as_channels(impulse)
+        impulse = impulse * self.normalization_scale(impulse, sample_rate)
+        if impulse.shape[1] == 1:
+            # A mono impulse feeds both ears, keeping the output stereo
+            impulse = np.repeat(impulse, 2, axis=1)
+        elif impulse.shape[1] != 2:
+            raise ValueError(f"Reverb impulse must be mono or stereo, got {impulse.shape[1]} channels")
+
+        # Pre-compute one spectrum per partition: shape (partitions, bins, channels)
+        num_partitions = -(-len(impulse) // block_size)
+        padded = np.zeros((num_partitions * block_size, impulse.shape[1]))
+        padded[:len(impulse)] = impulse
+        partitions = padded.reshape(num_partitions, block_size, impulse.shape[1])
+        self.ir_spectra = np.fft.rfft(partitions, n=2 * block_size, axis=1)
+
+        # Frequency-domain delay line as a ring: slot `fdl_pos` holds the newest
+        # spectrum, so each partition lines up with a rolled view of the IR
+        self.fdl = np.zeros_like(self.ir_spectra)
+        self.fdl_pos = 0
+        self.input_buffer = None
+
+    @staticmethod
+    def generate_impulse(decay: float, sample_rate: int, seed: int = None) -> np.ndarray:
+        """Stereo noise impulse with a quadratic decay, as built in effects.ts."""
+        length = max(int(sample_rate * decay), 1)
+        rng = np.random.default_rng(seed)
+        envelope = (1 - np.arange(length) / length) ** 2
+        noise = rng.random((length, 2)) * 2 - 1
+        return noise * envelope[:, np.newaxis]
+
+    @classmethod
+    def normalization_scale(cls, impulse: np.ndarray, sample_rate: int) -> float:
+        """Equal-power normalization applied by ConvolverNode (normalize=true)."""
+        power = np.sqrt(np.sum(impulse ** 2) / impulse.size)
+        if not np.isfinite(power) or power < cls.MIN_POWER:
+            power = cls.MIN_POWER
+        scale = cls.GAIN_CALIBRATION / power
+        scale *= cls.GAIN_CALIBRATION_SAMPLE_RATE / sample_rate
+        return scale
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Processes exactly `block_size` samples. Output is always stereo."""
+        block = _as_channels(block)
+        n = self.block_size
+        ir_channels = self.ir_spectra.shape[2]
+
+        # A mono source is convolved with each impulse channel
+        if block.shape[1] == 1:
+            wet_input = np.repeat(block, ir_channels, axis=1)
+        else:
+            wet_input = block
+
+        if self.input_buffer is None or self.input_buffer.shape[1] != wet_input.shape[1]:
+            self.input_buffer = np.zeros((2 * n, wet_input.shape[1]))
+
+        # Slide the 2N input window and transform it once
+        self.input_buffer[:n] = self.input_buffer[n:]
+        self.input_buffer[n:] = wet_input
+        spectrum = np.fft.rfft(self.input_buffer, axis=0)
+
+        # Push the new spectrum into the frequency-domain delay line
+        self.fdl_pos = (self.fdl_pos - 1) % len(self.fdl)
+        self.fdl[self.fdl_pos] = spectrum
+
+        # fdl[(pos + p) % P] holds the input from p blocks ago
+        p = self.fdl_pos
+        accumulated = (np.einsum('pbc,pbc->bc', self.fdl[p:], self.ir_spectra[:len(self.fdl) - p])
+                       + np.einsum('pbc,pbc->bc', self.fdl[:p], self.ir_spectra[len(self.fdl) - p:]))
+        wet = np.fft.irfft(accumulated, n=2 * n, axis=0)[n:]
+
+        return _mix(block * self.dry, wet * self.wet)
+
+
+class FeedbackDelay:
+    """
+    Delay line with feedback, mirroring createDelayEffect (also used for echo).
+
+    The signal written into the line is w[n] = x[n] + feedback * w[n - D] and
+    the wet output is w[n - D]. Since every sample only depends on values at
+    least D samples old, the recursion is evaluated D samples at a time as
+    plain array operations instead of one sample at a time.
+    """
+
+    def __init__(self, time: float = 0.3, feedback: float = 0.4, wetDry: float = 0.25,
+                 sample_rate: int = 44100, **_):
+        # DelayNode(maxDelayTime=2) inside a cycle: clamp to [quantum, 2s]
+        self.delay_samples = int(min(max(round(time * sample_rate), RENDER_QUANTUM), 2 * sample_rate))
+        self.feedback = feedback
+        self.wet = wetDry
+        self.dry = 1 - wetDry
+        self.line = None
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = _as_channels(block)
+        d = self.delay_samples
+
+        if self.line is None or self.line.shape[1] != block.shape[1]:
+            self.line = np.zeros((d, block.shape[1]))
+
+        # Work on [history | block] so w[n - d] is always addressable
+        written = np.concatenate([self.line, np.empty_like(block)])
+        for start in range(0, len(block), d):
+            end = min(start + d, len(block))
+            written[d + start:d + end] = block[start:end] + self.feedback * written[start:end]
+
+        delayed = written[:len(block)]
+        self.line = written[-d:]
+
+        return block * self.dry + delayed * self.wet
+
+
+class Chorus:
+    """
+    LFO-modulated delay, mirroring createChorusEffect.
+
+    Delay time is 20ms + depth * sin(2*pi*rate*t); read positions for a whole
+    block are computed at once and sampled with linear interpolation.
+    """
+
+    BASE_DELAY = 0.02
+    MAX_DELAY = 0.1  # createDelay(0.1)
+
+    def __init__(self, rate: float = 1.5, depth: float = 10, wetDry: float = 0.4,
+                 sample_rate: int = 44100, **_):
+        self.sample_rate = sample_rate
+        self.rate = rate
+        self.depth = depth / 1000
+        self.wet = wetDry
+        self.dry = 1 - wetDry
+        self.history_size = int(np.ceil(self.MAX_DELAY * sample_rate)) + 1
+        self.history = None
+        self.position = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = _as_channels(block)
+        n = len(block)
+
+        if self.history is None or self.history.shape[1] != block.shape[1]:
+            self.history = np.zeros((self.history_size, block.shape[1]))
+
+        t = (self.position + np.arange(n)) / self.sample_rate
+        delay = self.BASE_DELAY + self.depth * np.sin(2 * np.pi * self.rate * t)
+        delay = np.clip(delay, 0, self.MAX_DELAY) * self.sample_rate
+
+        buffer = np.concatenate([self.history, block])
+        read = self.history_size + np.arange(n) - delay
+        index = np.floor(read).astype(np.int64)
+        frac = (read - index)[:, np.newaxis]
+        next_index = np.minimum(index + 1, len(buffer) - 1)
+        delayed = buffer[index] * (1 - frac) + buffer[next_index] * frac
+
+        self.history = buffer[-self.history_size:]
+        self.position += n
+
+        return block * self.dry + delayed * self.wet
+
+
+class SubliminalMask:
+    """
+    Lowpass + gain reduction, mirroring createSubliminalMaskEffect.
+
+    The biquad uses the Web Audio lowpass formula, where Q is given in dB.
+    `noiseAmount` is accepted for parity but, as in the browser chain, unused.
+
+    The recursion is evaluated CHUNK samples at a time in state-space form:
+    each chunk's output is its zero-state response (a Toeplitz matrix of the
+    impulse response) plus the response to the 2-value filter state carried
+    in from the previous chunk. Only that small state is updated sequentially.
+    """
+
+    Q_DB = 1
+    CHUNK = 256
+
+    def __init__(self, maskVolume: float = 0.7, noiseAmount: float = 0.3,
+                 sample_rate: int = 44100, **_):
+        cutoff = 800 + (1 - maskVolume) * 3000  # 800-3800 Hz
+        self.gain = 1 - maskVolume * 0.5
+
+        w0 = 2 * np.pi * cutoff / sample_rate
+        alpha = np.sin(w0) / (2 * 10 ** (self.Q_DB / 20))
+        cos_w0 = np.cos(w0)
+        a0 = 1 + alpha
+        self.b = np.array([(1 - cos_w0) / 2, 1 - cos_w0, (1 - cos_w0) / 2]) / a0
+        self.a = np.array([a0, -2 * cos_w0, 1 - alpha]) / a0
+        self.state = None
+        self._build_chunk_matrices()
+
+    def _step(self, x, state):
+        """One transposed direct form II step; returns (y, new_state)."""
+        b0, b1, b2 = self.b
+        _, a1, a2 = self.a
+        y = b0 * x + state[0]
+        return y, np.array([b1 * x - a1 * y + state[1], b2 * x - a2 * y])
+
+    def _build_chunk_matrices(self):
+        n = self.CHUNK
+
+        # Impulse response and the state it leaves behind after each step
+        impulse = np.zeros(n)
+        trail = np.zeros((n, 2))
+        state = np.zeros(2)
+        for k in range(n):
+            impulse[k], state = self._step(1.0 if k == 0 else 0.0, state)
+            trail[k] = state
+
+        index = np.arange(n)
+        lag = index[:, np.newaxis] - index[np.newaxis, :]
+        self.zero_state = np.where(lag >= 0, impulse[np.clip(lag, 0, None)], 0.0)  # (n, n)
+        self.input_to_state = trail[::-1].T.copy()  # (2, n): input at j -> end state
+
+        # Output and end state produced by each unit initial state
+        self.state_to_output = np.zeros((n, 2))
+        self.state_transition = np.zeros((2, 2))
+        for m in range(2):
+            state = np.eye(2)[m]
+            for k in range(n):
+                self.state_to_output[k, m], state = self._step(0.0, state)
+            self.state_transition[:, m] = state
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = _as_channels(block)
+        n = self.CHUNK
+        channels = block.shape[1]
+
+        if self.state is None or self.state.shape[1] != channels:
+            self.state = np.zeros((2, channels))
+
+        output = np.empty_like(block)
+        full = len(block) // n * n
+        if full:
+            chunks = block[:full].reshape(-1, n, channels)
+            state_in = self.input_to_state @ chunks  # (chunks, 2, channels)
+            starts = np.empty_like(state_in)
+            state = self.state
+            for c in range(len(chunks)):
+                starts[c] = state
+                state = self.state_transition @ state + state_in[c]
+            self.state = state
+            filtered = self.zero_state @ chunks + self.state_to_output @ starts
+            output[:full] = filtered.reshape(full, channels)
+
+        # Leftover samples of a block that isn't a whole number of chunks
+        for i in range(full, len(block)):
+            output[i], self.state = self._step(block[i], self.state)
+
+        return output * self.gain
+
+
+class BinauralPan:
+    """
+    LFO-driven stereo panning, mirroring createBinauralPanEffect.
+
+    Pan follows 0.8 * sin(2*pi*panRate*t) and uses the StereoPannerNode
+    equal-power law. `frequency` is accepted for parity but unused, as in
+    the browser chain.
+    """
+
+    PAN_RANGE = 0.8
+
+    def __init__(self, frequency: float = 10, panRate: float = 0.5,
+                 sample_rate: int = 44100, **_):
+        self.sample_rate = sample_rate
+        self.pan_rate = panRate
+        self.position = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        block = _as_channels(block)
+        n = len(block)
+
+        t = (self.position + np.arange(n)) / self.sample_rate
+        pan = self.PAN_RANGE * np.sin(2 * np.pi * self.pan_rate * t)
+        self.position += n
+
+        if block.shape[1] == 1:
+            x = (pan + 1) / 2
+            mono = block[:, 0]
+            return np.column_stack((mono * np.cos(x * np.pi / 2), mono * np.sin(x * np.pi / 2)))
+
+        left, right = block[:, 0], block[:, 1]
+        x = np.where(pan <= 0, pan + 1, pan)
+        gain_l = np.cos(x * np.pi / 2)
+        gain_r = np.sin(x * np.pi / 2)
+        out_l = np.where(pan <= 0, left + right * gain_l, left * gain_l)
+        out_r = np.where(pan <= 0, right * gain_r, right + left * gain_r)
+        return np.column_stack((out_l, out_r))
+
+
+EFFECT_PROCESSORS = {
+    'reverb': ConvolutionReverb,
+    'delay': FeedbackDelay,
+    'echo': FeedbackDelay,
+    'chorus': Chorus,
+    'subliminal': SubliminalMask,
+    'binaural-pan': BinauralPan,
+}
+
+
+class EffectChain:
+    """
+    Server-side equivalent of createEffectChain / processAudioWithEffects.
+
+    Active effects are applied in order, block by block, writing straight
+    into a preallocated output; apart from the input and output buffers,
+    memory stays bounded by the block size and effect state. By default the output keeps the length of the
+    input, as processAudioWithEffects does. An export (ExportModal) renders
+    each track into a session-length context, so reverb and delay tails ring
+    on after the source ends; pass `output_length` to render that tail by
+    flushing silence through the chain.
+    """
+
+    def __init__(self, effects: list, sample_rate: int = 44100, block_size: int = 4096,
+                 seed: int = None):
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.processors = []
+
+        for effect in effects:
+            if not effect.get('active', True):
+                continue
+            effect_type = effect.get('type')
+            if effect_type not in EFFECT_PROCESSORS:
+                continue
+
+            # effects.ts builds echo with the delay defaults, so an echo's own
+            # `delay` param is ignored there; keep the same behaviour.
+            defaults_key = 'delay' if effect_type == 'echo' else effect_type
+            params = {**DEFAULT_EFFECT_PARAMS[defaults_key], **(effect.get('params') or {})}
+
+            processor_cls = EFFECT_PROCESSORS[effect_type]
+            if processor_cls is ConvolutionReverb:
+                processor = processor_cls(sample_rate=sample_rate, block_size=block_size,
+                                          seed=seed, **params)
+            else:
+                processor = processor_cls(sample_rate=sample_rate, **params)
+            self.processors.append(processor)
+
+    def process(self, audio: np.ndarray, volume: float = 1.0,
+                output_length: int = None) -> np.ndarray:
+        """
+        Render audio through the chain.
+
+        Args:
+            audio: Mono (samples,) or multichannel (samples, channels) array
+            volume: Track gain applied after the chain
+            output_length: Samples to render (default: len(audio)). Longer
+                           than the input renders the effect tails; shorter cuts.
+
+        Returns:
+            Array with shape (output_length, channels); mono stays mono unless
+            an effect (reverb, binaural-pan) widens it to stereo
+        """
+        audio = _as_channels(audio)
+        total = len(audio) if output_length is None else int(output_length)
+        n = self.block_size
+
+        print(f"[Effects] Rendering {len(self.processors)} effect(s) over {total / self.sample_rate:.1f}s")
+
+        output = None
+        for start in range(0, total, n):
+            # Silence past the end of the source is what flushes the tails out;
+            # the last block is zero-padded since the reverb needs whole blocks
+            source = audio[start:min(start + n, total)]
+            block = np.zeros((n, audio.shape[1]))
+            block[:len(source)] = source
+            for processor in self.processors:
+                block = processor.process(block)
+
+            # Reverb and binaural-pan widen mono to stereo, and do so from the
+            # first block on, so the layout is known once that block is done
+            if output is None:
+                output = np.empty((total, block.shape[1]))
+            end = min(start + n, total)
+            output[start:end] = block[:end - start]
+
+        if output is None:
+            output = np.zeros((0, audio.shape[1]))
+        output *= volume
+        return output
+
+
+def apply_effects(audio: np.ndarray, effects: list, sample_rate: int = 44100,
+                  volume: float = 1.0, block_size: int = 4096, seed: int = None,
+                  output_length: int = None) -> np.ndarray:
+    """
+    Apply a studio effect list (as stored on a track) to an audio buffer.
+
+    Args:
+        audio: Mono or (samples, channels) audio
+        effects: List of {'type', 'active', 'params'} dicts, same shape as the studio
+        sample_rate: Sample rate of audio
+        volume: Track gain (0-1)
+        block_size: Processing block size in samples
+        seed: Seed for the reverb impulse noise (browser output is unseeded,
+              so comparisons against it need a tolerance)
+        output_length: Samples to render; longer than the input keeps the
+                       reverb/delay tails (e.g. up to the end of the session)
+
+    Returns:
+        Processed (samples, channels) array. Not limited: like the browser
+        chain it can peak above 1.0, so clip only once tracks are mixed
+        (AudioSafeGuard.quantize clips when writing 16-bit output).
+    """
+    chain = EffectChain(effects, sample_rate=sample_rate, block_size=block_size, seed=seed)
+    return chain.process(audio, volume=volume, output_length=output_length)
@@ -0,0 +1,474 @@
+import os
+import time
+import numpy as np
+
+TWO_PI = 2 * np.pi
+
+
+class KernelBackends:
+    """
+    Pluggable implementations of the engine's hottest inner loops.
+
+    Each kernel has a NumPy implementation (always available) and a plain
+    loop version that is JIT-compiled with Numba when it is installed. The
+    loops fuse what NumPy does in several full-length passes (and
+    temporaries) into one pass, and handle the sequential cases (running
+    sums, recursive state) that NumPy can't vectorize.
+
+    NumPy is the default, and Numba is only probed and imported when
+    SUBMAKER_KERNELS=numba is set. Every process that uses Numba pays for
+    importing it and loading each kernel from the on-disk cache (around 1s),
+    which outweighs the gains when main.py is spawned per request. The Numba
+    backend is meant for a persistent worker; run `main.py warmup` once with
+    it enabled at deploy time to keep JIT compilation off the first request.
+    """
+    NUMPY = 'numpy'
+    NUMBA = 'numba'
+
+
+# Numba is opt-in: it is never imported unless this asks for it
+REQUESTED_BACKEND = os.environ.get('SUBMAKER_KERNELS', '').strip().lower()
+
+numba = None
+NUMBA_AVAILABLE = None  # Unknown until probe_numba() runs
+
+
+def probe_numba() -> bool:
+    """
+    Capability probe: imports Numba once and caches the result. Numba can
+    also fail to import when it doesn't support the installed NumPy, so any
+    error counts as "unavailable".
+    """
+    global numba, NUMBA_AVAILABLE
+    if NUMBA_AVAILABLE is None:
+        try:
+            import numba as numba_module
+            numba = numba_module
+            NUMBA_AVAILABLE = True
+        except Exception:
+            NUMBA_AVAILABLE = False
+    return NUMBA_AVAILABLE
+
+
+# ---------------------------------------------------------------------------
+# NumPy backend
+# ---------------------------------------------------------------------------
+
+def voss_mccartney_draws(samples: int, num_rows: int) -> int:
+    """Number of random values voss_mccartney consumes for a given length."""
+    return sum(max(samples - 1, 0) >> row for row in range(num_rows))
+
+
+def _voss_mccartney_numpy(values, samples, num_rows):
+    # Row r is refreshed every 2^r samples, so its value at sample i is
+    # update number (i >> r). `values` is in draw order: by sample, then by
+    # row, so each update's value sits at (first draw of its sample) + row.
+    refreshed = np.zeros(samples, dtype=np.int64)
+    for row in range(num_rows):
+        refreshed[::1 << row] += 1
+    refreshed[:1] = 0
+    first_draw = np.cumsum(refreshed) - refreshed
+
+    output = np.zeros(samples)
+    index = np.arange(samples)
+    for row in range(num_rows):
+        updates = np.arange(1 << row, samples, 1 << row)
+        row_values = np.concatenate(([0.0], values[first_draw[updates] + row]))
+        output += row_values[index >> row]
+    return output / num_rows
+
+
+def _brown_noise_numpy(white, window_size):
+    brown = np.cumsum(white)
+    if window_size <= 0:
+        return brown
+
+    # Centered running mean, equivalent to np.convolve(brown, box, 'same'),
+    # computed from a prefix sum in O(n) instead of O(n * window)
+    n = len(brown)
+    centre = (window_size - 1) // 2
+    prefix = np.concatenate(([0.0], np.cumsum(brown)))
+    index = np.arange(n)
+    hi = np.minimum(index + centre + 1, n)
+    lo = np.maximum(index + centre - window_size + 1, 0)
+    return brown - (prefix[hi] - prefix[lo]) / window_size
+
+
+def _sine_bank_numpy(freqs, amps, samples, step):
+    t = np.arange(samples) * step
+    output = np.zeros(samples)
+    for freq, amp in zip(freqs, amps):
+        output += amp * np.sin(TWO_PI * freq * t)
+    return output
+
+
+def _pulse_envelope_numpy(samples, step, pulse_freq, duty_cycle, window):
+    t = np.arange(samples) * step
+    envelope = ((t * pulse_freq) % 1.0 < duty_cycle).astype(float)
+    if len(window) > 0:
+        # 'same' alignment, but always `samples` long: np.convolve's own 'same'
+        # mode returns the window length when the window is the longer one
+        centre = (len(window) - 1) // 2
+        envelope = np.convolve(envelope, window)[centre:centre + samples]
+    return envelope
+
+
+def _apply_fade_numpy(audio, fade_in_samples, fade_out_samples):
+    if fade_in_samples > 0:
+        audio[:fade_in_samples] *= np.linspace(0, 1, fade_in_samples)[:, np.newaxis]
+    if fade_out_samples > 0:
+        audio[-fade_out_samples:] *= np.linspace(1, 0, fade_out_samples)[:, np.newaxis]
+    return audio
+
+
+def _quantize_pcm16_numpy(flat, dither, seed):
+    scaled = flat * 32767.0
+    if dither:
+        # TPDF dither straight from NumPy's generator. It differs from the
+        # compiled loop's noise, which is fine: only the statistics matter.
+        rng = np.random.default_rng(seed)
+        scaled += rng.random(len(flat))
+        scaled -= rng.random(len(flat))
+    np.rint(scaled, out=scaled)
+    np.clip(scaled, -32768, 32767, out=scaled)
+    return scaled.astype(np.int16)
+
+
+# ---------------------------------------------------------------------------
+# Fused loops (compiled with Numba when available)
+# ---------------------------------------------------------------------------
+
+def _voss_mccartney_loop(values, samples, num_rows):
+    output = np.zeros(samples)
+    rows = np.zeros(num_rows)
+    draw = 0
+
+    running_sum = 0.0
+    for i in range(1, samples):
+        for row in range(num_rows):
+            # Rows refresh on multiples of 2^row; stop at the first that doesn't
+            if i & ((1 << row) - 1) != 0:
+                break
+            new_value = values[draw]
+            draw += 1
+            running_sum += new_value - rows[row]
+            rows[row] = new_value
+        output[i] = running_sum / num_rows
+    return output
+
+
+def _brown_noise_loop(white, window_size):
+    n = len(white)
+    brown = np.empty(n)
+    level = 0.0
+    for i in range(n):
+        level += white[i]
+        brown[i] = level
+    if window_size <= 0:
+        return brown
+
+    # Sliding window sum over [i + centre - window + 1, i + centre]
+    centre = (window_size - 1) // 2
+    output = np.empty(n)
+    window_sum = 0.0
+    for j in range(min(centre + 1, n)):
+        window_sum += brown[j]
+    for i in range(n):
+        output[i] = brown[i] - window_sum / window_size
+        enter = i + centre + 1
+        leave = i + centre - window_size + 1
+        if enter < n:
+            window_sum += brown[enter]
+        if leave >= 0:
+            window_sum -= brown[leave]
+    return output
+
+
+def _sine_bank_loop(freqs, amps, samples, step):
+    output = np.empty(samples)
+    for i in range(samples):
+        t = i * step
+        acc = 0.0
+        for k in range(len(freqs)):
+            acc += amps[k] * np.sin(TWO_PI * freqs[k] * t)
+        output[i] = acc
+    return output
+
+
+def _pulse_envelope_loop(samples, step, pulse_freq, duty_cycle, window):
+    gate = np.empty(samples)
+    for i in range(samples):
+        gate[i] = 1.0 if (i * step * pulse_freq) % 1.0 < duty_cycle else 0.0
+
+    taps = len(window)
+    if taps == 0:
+        return gate
+
+    # The gate is 0/1, so 'same' convolution (aligned like np.convolve) reduces
+    # to the window's step response around each on/off edge. Cost scales with
+    # the edges inside the window instead of the window length.
+    step_response = np.cumsum(window)
+    edge_pos = np.empty(samples + 1, dtype=np.int64)
+    edge_sign = np.empty(samples + 1)
+    num_edges = 0
+    previous = 0.0
+    for e in range(samples + 1):
+        current = gate[e] if e < samples else 0.0
+        if current != previous:
+            edge_pos[num_edges] = e
+            edge_sign[num_edges] = current - previous
+            num_edges += 1
+        previous = current
+
+    centre = (taps - 1) // 2
+    envelope = np.empty(samples)
+    first = 0
+    for i in range(samples):
+        lo = i + centre - taps + 1
+        hi = i + centre
+        # Edges at or before `lo` are fully inside the window: just the gate level there
+        acc = step_response[taps - 1] * gate[lo] if lo >= 0 else 0.0
+        while first < num_edges and edge_pos[first] <= lo:
+            first += 1
+        k = first
+        while k < num_edges and edge_pos[k] <= hi:
+            acc += edge_sign[k] * step_response[hi - edge_pos[k]]
+            k += 1
+        envelope[i] = acc
+    return envelope
+
+
+def _apply_fade_loop(audio, fade_in_samples, fade_out_samples):
+    n, channels = audio.shape
+    if fade_in_samples > 0:
+        for i in range(fade_in_samples):
+            gain = i / (fade_in_samples - 1) if fade_in_samples > 1 else 0.0
+            for c in range(channels):
+                audio[i, c] *= gain
+    if fade_out_samples > 0:
+        start = n - fade_out_samples
+        for i in range(fade_out_samples):
+            gain = 1.0 - i / (fade_out_samples - 1) if fade_out_samples > 1 else 1.0
+            for c in range(channels):
+                audio[start + i, c] *= gain
+    return audio
+
+
+def _uniform_loop(counter):
+    # splitmix64 hash of a counter, mapped to [0, 1): stateless, so the
+    # fused loop needs no RNG object
+    z = counter + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)) * (1.0 / 9007199254740992.0)
+
+
+def _quantize_pcm16_loop(flat, dither, seed):
+    output = np.empty(len(flat), dtype=np.int16)
+    base = np.uint64(seed)
+    for i in range(len(flat)):
+        value = flat[i] * 32767.0
+        if dither:
+            counter = np.uint64(i) * np.uint64(2) + base
+            value += _uniform_loop(counter) - _uniform_loop(counter + np.uint64(1))
+        value = np.rint(value)
+        if value > 32767.0:
+            value = 32767.0
+        elif value < -32768.0:
+            value = -32768.0
+        output[i] = np.int16(value)
+    return output
+
+
+NUMPY_KERNELS = {
+    'voss_mccartney': _voss_mccartney_numpy,
+    'brown_noise': _brown_noise_numpy,
+    'sine_bank': _sine_bank_numpy,
+    'pulse_envelope': _pulse_envelope_numpy,
+    'apply_fade': _apply_fade_numpy,
+    'quantize_pcm16': _quantize_pcm16_numpy,
+}
+
+LOOP_KERNELS = {
+    'voss_mccartney': _voss_mccartney_loop,
+    'brown_noise': _brown_noise_loop,
+    'sine_bank': _sine_bank_loop,
+    'pulse_envelope': _pulse_envelope_loop,
+    'apply_fade': _apply_fade_loop,
+    'quantize_pcm16': _quantize_pcm16_loop,
+}
+
+_numba_kernels = None
+_active = NUMPY_KERNELS
+
+
+def _compile_numba_kernels() -> dict:
+    """Wraps the loop kernels with numba.njit (compilation itself is lazy)."""
+    global _numba_kernels, _uniform_loop
+    if _numba_kernels is None:
+        _uniform_loop = numba.njit(cache=True)(_uniform_loop)
+        _numba_kernels = {name: numba.njit(cache=True)(fn) for name, fn in LOOP_KERNELS.items()}
+    return _numba_kernels
+
+
+def set_backend(name: str) -> str:
+    """
+    Switch kernel backend ('numba' or 'numpy').
+    Falls back to NumPy if Numba was requested but isn't available.
+    """
+    global _active
+    if name not in (KernelBackends.NUMPY, KernelBackends.NUMBA):
+        print(f"[Kernels] WARNING: Unknown backend '{name}', using NumPy kernels")
+    if name == KernelBackends.NUMBA and probe_numba():
+        _active = _compile_numba_kernels()
+        return KernelBackends.NUMBA
+    if name == KernelBackends.NUMBA:
+        print("[Kernels] Numba not available, using NumPy kernels")
+    _active = NUMPY_KERNELS
+    return KernelBackends.NUMPY
+
+
+def get_backend() -> str:
+    return KernelBackends.NUMPY if _active is NUMPY_KERNELS else KernelBackends.NUMBA
+
+
+set_backend(REQUESTED_BACKEND or KernelBackends.NUMPY)
+
+
+# ---------------------------------------------------------------------------
+# Public kernels (dispatch to the active backend)
+# ---------------------------------------------------------------------------
+
+def voss_mccartney(values: np.ndarray, samples: int, num_rows: int) -> np.ndarray:
+    """
+    Voss-McCartney pink noise.
+
+    Args:
+        values: voss_mccartney_draws(samples, num_rows) random values,
+                already centered (e.g. np.random.random(n) - 0.5), consumed
+                sample by sample and row by row within a sample
+        samples: Output length
+        num_rows: Number of octave rows
+    """
+    return _active['voss_mccartney'](np.ascontiguousarray(values, dtype=np.float64),
+                                     int(samples), int(num_rows))
+
+
+def brown_noise(white: np.ndarray, window_size: int) -> np.ndarray:
+    """Integrates white noise and removes drift with a centered running mean."""
+    return _active['brown_noise'](np.ascontiguousarray(white, dtype=np.float64), int(window_size))
+
+
+def sine_bank(freqs, amps, samples: int, step: float) -> np.ndarray:
+    """
+    Sum of sines sampled at t = i * step.
+    Phase is computed from the sample index rather than accumulated, so long
+    renders don't drift.
+    """
+    return _active['sine_bank'](np.asarray(freqs, dtype=np.float64),
+                                np.asarray(amps, dtype=np.float64),
+                                int(samples), float(step))
+
+
+def pulse_envelope(samples: int, step: float, pulse_freq: float, duty_cycle: float,
+                   window: np.ndarray) -> np.ndarray:
+    """On/off gate at pulse_freq smoothed by a normalized window (empty = no smoothing)."""
+    return _active['pulse_envelope'](int(samples), float(step), float(pulse_freq),
+                                     float(duty_cycle),
+                                     np.ascontiguousarray(window, dtype=np.float64))
+
+
+def apply_fade(audio: np.ndarray, fade_in_samples: int, fade_out_samples: int) -> np.ndarray:
+    """Linear fade-in/out applied in place (mono or (samples, channels))."""
+    _active['apply_fade'](audio.reshape(len(audio), -1), int(fade_in_samples), int(fade_out_samples))
+    return audio
+
+
+def quantize_pcm16(audio: np.ndarray, dither: bool, seed: int) -> np.ndarray:
+    """Scale, TPDF-dither, round and clip float audio to int16 in one pass."""
+    flat = np.ascontiguousarray(audio, dtype=np.float64).ravel()
+    return _active['quantize_pcm16'](flat, bool(dither), int(seed)).reshape(np.shape(audio))
+
+
+# ---------------------------------------------------------------------------
+# Warmup & backend equivalence
+# ---------------------------------------------------------------------------
+
+def _sample_calls(samples: int, rng) -> dict:
+    """Representative arguments for every kernel, with production dtypes."""
+    window = np.hanning(20)
+    return {
+        'voss_mccartney': (rng.random(voss_mccartney_draws(samples, 16)) - 0.5, samples, 16),
+        'brown_noise': (rng.random(samples) * 2 - 1, 441),
+        'sine_bank': (np.array([528.0, 1056.0, 1584.0]), np.array([1.0, 0.25, 0.125]),
+                      samples, 1 / 44100),
+        'pulse_envelope': (samples, 1 / 44100, 10.0, 0.5, window / window.sum()),
+        'apply_fade': (rng.random((samples, 1)), samples // 4, samples // 4),
+        'quantize_pcm16': (rng.random(samples) * 2 - 1, True, 12345),
+    }
+
+
+def warmup() -> float:
+    """
+    Compile (or load from the on-disk cache) every Numba kernel so the first
+    real request doesn't pay JIT cost. No-op on the NumPy backend.
+    Returns seconds spent.
+    """
+    start = time.perf_counter()
+    if get_backend() == KernelBackends.NUMBA:
+        calls = _sample_calls(256, np.random.default_rng(0))
+        for name, args in calls.items():
+            _active[name](*args)
+    elapsed = time.perf_counter() - start
+    print(f"[Kernels] Backend={get_backend()}, warmup took {elapsed:.2f}s")
+    return elapsed
+
+
+def _compare_backends(name: str, compiled: dict, args: tuple) -> float:
+    """Max absolute difference between the NumPy and compiled kernel on `args`."""
+    # apply_fade works in place, so give each backend its own copy
+    expected = NUMPY_KERNELS[name](*[a.copy() if isinstance(a, np.ndarray) else a for a in args])
+    actual = compiled[name](*[a.copy() if isinstance(a, np.ndarray) else a for a in args])
+    if expected.shape != actual.shape:
+        raise RuntimeError(f"[Kernels] {name}: backends return shapes "
+                           f"{expected.shape} and {actual.shape}")
+    return float(np.max(np.abs(expected.astype(np.float64) - actual.astype(np.float64)), initial=0.0))
+
+
+def check_equivalence(samples: int = 44100, tolerance: float = 1e-9) -> dict:
+    """
+    Run every kernel on both backends with identical inputs and compare.
+
+    Returns:
+        Dict of kernel name -> max absolute difference.
+
+    Raises:
+        RuntimeError: if any kernel differs by more than `tolerance`.
+                      Quantize must match exactly without dither; with
+                      dither the backends use different noise, so it may
+                      differ by up to 2 LSB.
+    """
+    if not probe_numba():
+        print("[Kernels] Numba not available, nothing to compare")
+        return {}
+
+    compiled = _compile_numba_kernels()
+    calls = _sample_calls(samples, np.random.default_rng(0))
+    results = {}
+    for name, args in calls.items():
+        diff = _compare_backends(name, compiled, args)
+        limit = tolerance
+        if name == 'quantize_pcm16':
+            limit = 2
+            flat, _, seed = args
+            results[name] = _compare_backends(name, compiled, (flat, False, seed))
+            if results[name] > 0:
+                raise RuntimeError(f"[Kernels] {name}: undithered output differs by {results[name]}")
+        else:
+            results[name] = diff
+        if diff > limit:
+            raise RuntimeError(f"[Kernels] {name}: backends differ by {diff}")
+
+    print(f"[Kernels] Backends match: {results}")
+    return results
@@ -12,6 +12,8 @@ from generators import SpectralGenerator, SilentSubliminalGenerator
 from binaural import BinauralBeatGenerator, IsochronicToneGenerator
 from noise import PinkNoiseGenerator, BrownNoiseGenerator, WhiteNoiseGenerator
 from solfeggio import SolfeggioGenerator
+from safety import AudioSafeGuard
+import kernels
 
 def save_wav(filename, rate, data, stereo=False):
     """Save audio data to WAV file. Supports mono and stereo."""
@@ -19,12 +21,12 @@ def save_wav(filename, rate, data, stereo=False):
         # Stereo: data shape is (samples, 2)
         channels = 2
         # Interleave left and right channels
-        scaled = np.int16(data * 32767)
+        scaled = AudioSafeGuard.quantize(data)
         frames = scaled.flatten('C')  # Row-major: L0, R0, L1, R1, ...
     else:
         # Mono
         channels = 1
-        scaled = np.int16(data * 32767)
+        scaled = AudioSafeGuard.quantize(data)
         frames = scaled
     
     with wave.open(filename, 'w') as wav_file:
@@ -35,24 +37,55 @@ def save_wav(filename, rate, data, stereo=False):
         
     print(f"[Output] File saved: {filename} ({'stereo' if channels == 2 else 'mono'})")
 
+def load_wav(filename):
+    """Load a 16-bit PCM WAV file. Returns (rate, data) with data in [-1, 1]."""
+    with wave.open(filename, 'r') as wav_file:
+        channels = wav_file.getnchannels()
+        rate = wav_file.getframerate()
+        if wav_file.getsampwidth() != 2:
+            raise ValueError("Only 16-bit PCM WAV input is supported")
+        frames = wav_file.readframes(wav_file.getnframes())
+    
+    data = np.frombuffer(frames, dtype=np.int16).astype(np.float64) / 32768
+    if channels > 1:
+        data = data.reshape(-1, channels)
+    return rate, data
+
 def main():
     parser = argparse.ArgumentParser(description="Subliminal Audio Engine")
     parser.add_argument("command", choices=[
         "spectral", "silent", 
         "binaural", "isochronic",
         "pink_noise", "brown_noise", "white_noise",
-        "solfeggio"
+        "solfeggio",
+        "effects",
+        "warmup"
     ], help="Type of generation")
     parser.add_argument("--text", help="Text intention (for spectral/silent)")
-    parser.add_argument("--out", required=True, help="Output filename")
+    parser.add_argument("--out", help="Output filename")
     parser.add_argument("--duration", type=int, default=60, help="Duration in seconds")
     parser.add_argument("--preset", help="Preset name (for binaural/isochronic)")
     parser.add_argument("--frequency", help="Frequency key or value (for solfeggio)")
+    parser.add_argument("--input", help="Input WAV file (for effects)")
+    parser.add_argument("--effects", help="JSON list of track effects (for effects)")
+    parser.add_argument("--volume", type=float, default=1.0, help="Track gain 0-1 (for effects)")
+    parser.add_argument("--tail", type=float, default=0.0, help="Seconds to render past the input's end (for effects)")
     
     args = parser.parse_args()
+    if args.command != "warmup" and not args.out:
+        parser.error("--out is required")
     
     try:
-        if args.command == "spectral":
+        if args.command == "warmup":
+            # Run at deploy time with SUBMAKER_KERNELS=numba: compiles and caches
+            # the Numba kernels and checks them against the NumPy implementations
+            kernels.warmup()
+            if kernels.get_backend() == kernels.KernelBackends.NUMBA:
+                kernels.check_equivalence()
+            else:
+                print("[Kernels] NumPy backend: nothing to compile, equivalence check not run")
+            
+        elif args.command == "spectral":
             if not args.text:
                 raise ValueError("--text is required for spectral")
             gen = SpectralGenerator()
@@ -99,6 +132,21 @@ def main():
             audio = gen.generate(frequency_key=freq_key, duration_sec=args.duration, sample_rate=44100)
             save_wav(args.out, 44100, audio)
             
+        elif args.command == "effects":
+            if not args.input or not args.effects:
+                raise ValueError("--input and --effects are required for effects")
+            # Imported here so the generators don't pay for loading the effects engine
+            from effects import apply_effects
+            rate, source = load_wav(args.input)
+            effects = json.loads(args.effects)
+            output_length = len(source) + int(args.tail * rate)
+            audio = apply_effects(source, effects, sample_rate=rate, volume=args.volume,
+                                  output_length=output_length)
+            if audio.shape[1] == 1:
+                save_wav(args.out, rate, audio[:, 0])
+            else:
+                save_wav(args.out, rate, audio, stereo=True)
+            
     except Exception as e:
         print(f"[Error] Generation failed: {e}")
         import traceback
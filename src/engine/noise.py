@@ -1,4 +1,5 @@
 import numpy as np
+import kernels
 from safety import AudioSafeGuard
 
 class PinkNoiseGenerator:
@@ -26,22 +27,10 @@ class PinkNoiseGenerator:
         num_rows = 16
         max_key = 2 ** num_rows
         
-        output = np.zeros(samples)
-        running_sum = 0
-        rows = np.zeros(num_rows)
-        
-        for i in range(samples):
-            key = i
-            last_key = (i - 1) if i > 0 else 0
-            diff = key ^ last_key
-            
-            for row in range(num_rows):
-                if diff & (1 << row):
-                    running_sum -= rows[row]
-                    rows[row] = np.random.random() - 0.5
-                    running_sum += rows[row]
-            
-            output[i] = running_sum / num_rows
+        # Row r refreshes every 2^r samples; draw all refresh values up front,
+        # in the same order the per-sample loop would draw them
+        values = np.random.random(kernels.voss_mccartney_draws(samples, num_rows)) - 0.5
+        output = kernels.voss_mccartney(values, samples, num_rows)
         
         # Normalize
         output = AudioSafeGuard.normalize(output, target_db=-6.0)
@@ -72,16 +61,10 @@ class BrownNoiseGenerator:
         # Generate white noise
         white = np.random.random(samples) * 2 - 1
         
-        # Integrate (cumulative sum) to get brown noise
-        brown = np.cumsum(white)
-        
-        # High-pass filter to remove DC offset and very low frequencies
-        # Simple approach: subtract running mean
+        # Integrate (cumulative sum) to get brown noise, then high-pass
+        # to remove DC offset and very low frequencies by subtracting a running mean
         window_size = int(sample_rate * 0.1)  # 100ms window
-        if window_size > 0:
-            kernel = np.ones(window_size) / window_size
-            running_mean = np.convolve(brown, kernel, mode='same')
-            brown = brown - running_mean
+        brown = kernels.brown_noise(white, window_size)
         
         # Normalize
         brown = AudioSafeGuard.normalize(brown, target_db=-6.0)
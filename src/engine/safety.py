@@ -1,4 +1,5 @@
 import numpy as np
+import kernels
 
 class AudioSafeGuard:
     """
@@ -64,14 +65,16 @@ class AudioSafeGuard:
         fade_in_samples = min(fade_in_samples, max_fade)
         fade_out_samples = min(fade_out_samples, max_fade)
             
-        # Fade In
-        if fade_in_samples > 0:
-            fade_in = np.linspace(0, 1, fade_in_samples)
-            audio_data[:fade_in_samples] *= fade_in
-        
-        # Fade Out
-        if fade_out_samples > 0:
-            fade_out = np.linspace(1, 0, fade_out_samples)
-            audio_data[-fade_out_samples:] *= fade_out
-        
-        return audio_data
+        # Linear fade in/out, applied in place
+        return kernels.apply_fade(audio_data, fade_in_samples, fade_out_samples)
+
+    @staticmethod
+    def quantize(audio_data: np.ndarray, dither: bool = True, seed: int = None) -> np.ndarray:
+        """
+        Converts float audio in [-1, 1] to 16-bit PCM.
+        Adds TPDF dither (+/-1 LSB) before rounding so quiet passages don't
+        turn into correlated distortion, and clips instead of wrapping.
+        """
+        if seed is None:
+            seed = np.random.randint(0, 2 ** 31)
+        return kernels.quantize_pcm16(audio_data, dither, seed)
@@ -1,4 +1,5 @@
 import numpy as np
+import kernels
 from safety import AudioSafeGuard
 
 class SolfeggioGenerator:
@@ -62,17 +63,20 @@ class SolfeggioGenerator:
         
         print(f"[Solfeggio] Generating: {freq}Hz ({name}), Duration={duration_sec}s")
         
-        t = np.linspace(0, duration_sec, int(sample_rate * duration_sec), endpoint=False)
+        samples = int(sample_rate * duration_sec)
+        step = duration_sec / samples if samples else 0.0
         
-        # Generate fundamental frequency
-        audio = np.sin(2 * np.pi * freq * t)
+        # Fundamental frequency
+        freqs = [freq]
+        amps = [1.0]
         
         if add_harmonics:
             # Add subtle harmonics for a richer, more organic sound
             # 2nd harmonic at -12dB, 3rd at -18dB, 5th at -24dB
-            audio += 0.25 * np.sin(2 * np.pi * freq * 2 * t)  # Octave
-            audio += 0.125 * np.sin(2 * np.pi * freq * 3 * t)  # Perfect fifth + octave
-            audio += 0.0625 * np.sin(2 * np.pi * freq * 5 * t)  # Major third + 2 octaves
+            freqs += [freq * 2, freq * 3, freq * 5]  # Octave, fifth + octave, major third + 2 octaves
+            amps += [0.25, 0.125, 0.0625]
+        
+        audio = kernels.sine_bank(freqs, amps, samples, step)
         
         # Normalize and apply fades
         audio = AudioSafeGuard.normalize(audio, target_db=-6.0)
@@ -89,12 +93,11 @@ class SolfeggioGenerator:
         
         main_freqs = [396, 417, 528, 639, 741, 852]  # Core Solfeggio set
         
-        t = np.linspace(0, duration_sec, int(sample_rate * duration_sec), endpoint=False)
-        audio = np.zeros_like(t)
+        samples = int(sample_rate * duration_sec)
+        step = duration_sec / samples if samples else 0.0
         
-        for freq in main_freqs:
-            # Each frequency at reduced volume to leave headroom
-            audio += np.sin(2 * np.pi * freq * t) * 0.15
+        # Each frequency at reduced volume to leave headroom
+        audio = kernels.sine_bank(main_freqs, [0.15] * len(main_freqs), samples, step)
         
         audio = AudioSafeGuard.normalize(audio, target_db=-3.0)
         audio = AudioSafeGuard.apply_fade(audio, sample_rate, fade_in_ms=2000, fade_out_ms=2000)
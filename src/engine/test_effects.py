@@ -0,0 +1,168 @@
+import numpy as np
+import pytest
+
+from effects import BinauralPan, ConvolutionReverb, EffectChain, FeedbackDelay, SubliminalMask
+
+SAMPLE_RATE = 44100
+
+
+def process_in_blocks(processor, signal, sizes):
+    """Feed `signal` through `processor` in blocks of the given sizes (cycled)."""
+    out = []
+    start = 0
+    i = 0
+    while start < len(signal):
+        size = sizes[i % len(sizes)]
+        out.append(processor.process(signal[start:start + size]))
+        start += size
+        i += 1
+    return np.concatenate(out)
+
+
+def test_feedback_delay_matches_per_sample_loop():
+    delay, feedback, wet = 200, 0.7, 0.4
+    x = np.random.default_rng(0).standard_normal(5000)
+    processor = FeedbackDelay(time=delay / SAMPLE_RATE, feedback=feedback, wetDry=wet,
+                              sample_rate=SAMPLE_RATE)
+    assert processor.delay_samples == delay
+
+    # Block sizes below, at and above the delay length, so blocks straddle the line
+    actual = process_in_blocks(processor, x, [150, 1000, 1, 200, 333])[:, 0]
+
+    written = np.zeros(len(x))
+    expected = np.zeros(len(x))
+    for n in range(len(x)):
+        delayed = written[n - delay] if n >= delay else 0.0
+        written[n] = x[n] + feedback * delayed
+        expected[n] = (1 - wet) * x[n] + wet * delayed
+
+    np.testing.assert_allclose(actual, expected, atol=1e-12)
+
+
+@pytest.mark.parametrize('wet', [1.0, 0.3])
+def test_convolution_reverb_matches_direct_convolution(wet):
+    block = 256
+    impulse = ConvolutionReverb.generate_impulse(0.02, SAMPLE_RATE, seed=3)
+    x = np.random.default_rng(1).standard_normal(block * 12)
+    processor = ConvolutionReverb(wetDry=wet, sample_rate=SAMPLE_RATE, block_size=block,
+                                  impulse=impulse)
+
+    actual = process_in_blocks(processor, x, [block])
+
+    scale = ConvolutionReverb.normalization_scale(impulse, SAMPLE_RATE)
+    convolved = np.column_stack([np.convolve(x, impulse[:, c])[:len(x)] for c in range(2)]) * scale
+    expected = (1 - wet) * x[:, np.newaxis] + wet * convolved
+    np.testing.assert_allclose(actual, expected, atol=1e-12)
+
+
+def test_convolution_reverb_seed_is_reproducible():
+    x = np.random.default_rng(2).standard_normal(512)
+    first = ConvolutionReverb(decay=0.01, block_size=256, seed=7).process(x[:256])
+    second = ConvolutionReverb(decay=0.01, block_size=256, seed=7).process(x[:256])
+    np.testing.assert_array_equal(first, second)
+
+
+def test_convolution_reverb_mono_impulse_gives_stereo_output():
+    impulse = np.random.default_rng(4).random(300)
+    processor = ConvolutionReverb(impulse=impulse, block_size=256)
+    assert processor.process(np.ones(256)).shape == (256, 2)
+    assert processor.process(np.ones((256, 2))).shape == (256, 2)
+
+
+@pytest.mark.parametrize('mask_volume', [0.0, 0.7, 1.0])
+def test_subliminal_mask_matches_direct_form_biquad(mask_volume):
+    x = np.random.default_rng(5).standard_normal((2000, 2))
+    processor = SubliminalMask(maskVolume=mask_volume, sample_rate=SAMPLE_RATE)
+
+    # Whole chunks, leftovers shorter than a chunk, and single samples
+    chunk = SubliminalMask.CHUNK
+    actual = process_in_blocks(processor, x, [chunk * 3, 100, 1, chunk + 7])
+
+    b0, b1, b2 = processor.b
+    _, a1, a2 = processor.a
+    expected = np.zeros_like(x)
+    for n in range(len(x)):
+        x1 = x[n - 1] if n >= 1 else 0.0
+        x2 = x[n - 2] if n >= 2 else 0.0
+        y1 = expected[n - 1] if n >= 1 else 0.0
+        y2 = expected[n - 2] if n >= 2 else 0.0
+        expected[n] = b0 * x[n] + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+
+    np.testing.assert_allclose(actual, expected * processor.gain, atol=1e-12)
+
+
+def pan_curve(samples, pan_rate):
+    t = np.arange(samples) / SAMPLE_RATE
+    return BinauralPan.PAN_RANGE * np.sin(2 * np.pi * pan_rate * t)
+
+
+def test_binaural_pan_mono_is_equal_power():
+    samples = 4000
+    out = BinauralPan(panRate=2.0, sample_rate=SAMPLE_RATE).process(np.ones(samples))
+
+    x = (pan_curve(samples, 2.0) + 1) / 2
+    np.testing.assert_allclose(out[:, 0], np.cos(x * np.pi / 2), atol=1e-12)
+    np.testing.assert_allclose(out[:, 1], np.sin(x * np.pi / 2), atol=1e-12)
+    np.testing.assert_allclose(out[:, 0] ** 2 + out[:, 1] ** 2, 1.0, atol=1e-12)
+    # Centred at t=0
+    np.testing.assert_allclose(out[0], [np.sqrt(0.5), np.sqrt(0.5)], atol=1e-12)
+
+
+def test_binaural_pan_stereo_follows_stereo_panner_law():
+    samples = 4000
+    stereo = np.random.default_rng(6).standard_normal((samples, 2))
+    out = BinauralPan(panRate=2.0, sample_rate=SAMPLE_RATE).process(stereo)
+
+    pan = pan_curve(samples, 2.0)
+    left, right = stereo[:, 0], stereo[:, 1]
+    expected = np.empty_like(stereo)
+    for n, p in enumerate(pan):
+        if p <= 0:
+            x = p + 1
+            expected[n] = [left[n] + right[n] * np.cos(x * np.pi / 2), right[n] * np.sin(x * np.pi / 2)]
+        else:
+            x = p
+            expected[n] = [left[n] * np.cos(x * np.pi / 2), right[n] + left[n] * np.sin(x * np.pi / 2)]
+
+    np.testing.assert_allclose(out, expected, atol=1e-12)
+
+
+TAIL_EFFECTS = [
+    {'type': 'reverb', 'active': True, 'params': {'decay': 0.05}},
+    {'type': 'delay', 'active': True, 'params': {'time': 0.01}},
+]
+
+
+def test_effect_chain_output_length_renders_tail():
+    x = np.random.default_rng(7).standard_normal(3000)
+    chain = EffectChain(TAIL_EFFECTS, block_size=512, seed=1)
+    default = chain.process(x)
+
+    longer = EffectChain(TAIL_EFFECTS, block_size=512, seed=1).process(x, output_length=10000)
+    assert longer.shape == (10000, 2)
+    np.testing.assert_allclose(longer[:3000], default, atol=1e-12)
+    assert np.max(np.abs(longer[3000:])) > 0
+
+    shorter = EffectChain(TAIL_EFFECTS, block_size=512, seed=1).process(x, output_length=1000)
+    assert shorter.shape == (1000, 2)
+    np.testing.assert_allclose(shorter, default[:1000], atol=1e-12)
+
+
+@pytest.mark.parametrize('effect_type, channels', [
+    ('delay', 1),
+    ('chorus', 1),
+    ('subliminal', 1),
+    ('reverb', 2),
+    ('binaural-pan', 2),
+])
+def test_effect_chain_widens_mono_only_for_stereo_effects(effect_type, channels):
+    params = {'decay': 0.05} if effect_type == 'reverb' else {}
+    chain = EffectChain([{'type': effect_type, 'active': True, 'params': params}], block_size=512)
+    out = chain.process(np.random.default_rng(8).standard_normal(2000))
+    assert out.shape == (2000, channels)
+
+
+def test_effect_chain_skips_inactive_and_unknown_effects():
+    x = np.random.default_rng(9).standard_normal(1000)
+    chain = EffectChain([{'type': 'reverb', 'active': False}, {'type': 'flanger', 'active': True}])
+    np.testing.assert_array_equal(chain.process(x, volume=0.5)[:, 0], x * 0.5)
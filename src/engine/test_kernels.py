@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+import kernels
+
+
+@pytest.fixture
+def numpy_backend():
+    previous = kernels.get_backend()
+    kernels.set_backend(kernels.KernelBackends.NUMPY)
+    yield
+    kernels.set_backend(previous)
+
+
+@pytest.mark.parametrize('samples', [1, 7, 256, 44100])
+def test_backends_match(samples):
+    pytest.importorskip('numba')
+    results = kernels.check_equivalence(samples=samples)
+    assert set(results) == set(kernels.NUMPY_KERNELS)
+
+
+def test_check_equivalence_raises_on_mismatch(monkeypatch):
+    pytest.importorskip('numba')
+    compiled = dict(kernels._compile_numba_kernels())
+    compiled['sine_bank'] = lambda *args: kernels.NUMPY_KERNELS['sine_bank'](*args) + 1e-3
+    monkeypatch.setattr(kernels, '_compile_numba_kernels', lambda: compiled)
+    with pytest.raises(RuntimeError, match='sine_bank'):
+        kernels.check_equivalence(samples=64)
+
+
+def test_pulse_envelope_keeps_length_for_short_input(numpy_backend):
+    window = np.hanning(20)
+    envelope = kernels.pulse_envelope(7, 1 / 44100, 10.0, 0.5, window / window.sum())
+    assert envelope.shape == (7,)
+
+
+def test_voss_mccartney_matches_per_sample_loop(numpy_backend):
+    samples, num_rows = 5000, 16
+    values = np.random.default_rng(0).random(kernels.voss_mccartney_draws(samples, num_rows)) - 0.5
+
+    # Reference: the original generator loop, drawing values in order
+    expected = np.zeros(samples)
+    rows = np.zeros(num_rows)
+    running_sum = 0.0
+    draw = 0
+    for i in range(samples):
+        diff = i ^ ((i - 1) if i > 0 else 0)
+        for row in range(num_rows):
+            if diff & (1 << row):
+                running_sum -= rows[row]
+                rows[row] = values[draw]
+                draw += 1
+                running_sum += rows[row]
+        expected[i] = running_sum / num_rows
+
+    assert draw == len(values)
+    np.testing.assert_allclose(kernels.voss_mccartney(values, samples, num_rows), expected, atol=1e-12)
+
+
+def test_quantize_dither_stays_within_one_lsb(numpy_backend):
+    audio = np.linspace(-0.5, 0.5, 1000)
+    plain = kernels.quantize_pcm16(audio, False, 0).astype(np.int32)
+    dithered = kernels.quantize_pcm16(audio, True, 0).astype(np.int32)
+    assert np.max(np.abs(dithered - plain)) <= 1
+    assert np.any(dithered != plain)
+
+
+def test_quantize_clips_instead_of_wrapping(numpy_backend):
+    pcm = kernels.quantize_pcm16(np.array([1.5, -1.5]), False, 0)
+    assert pcm.tolist() == [32767, -32768]
+
+
+def test_unknown_backend_warns_and_uses_numpy(capsys):
+    previous = kernels.get_backend()
+    try:
+        assert kernels.set_backend('numbaa') == kernels.KernelBackends.NUMPY
+        assert "Unknown backend 'numbaa'" in capsys.readouterr().out
+    finally:
+        kernels.set_backend(previous)